@@ -1,22 +1,63 @@
+import atexit
+import contextvars
+import functools
 import http.client
 import json
 import os
+import random
+import ssl
+import threading
 import time
+import traceback
 import uuid
-import urllib.request
-import urllib.error
 import urllib.parse
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "y")
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    base_url: str
+    api_base_url: str
+    api_token: str
+    minio_endpoint: str
+    azurite_endpoint: str
+    gcs_endpoint: str
+    # E2E_GCS_IAM=1: fail instead of skipping when the GCS emulator lacks the IAM endpoint.
+    gcs_iam_required: bool
+    # Scenarios target independent backends and run concurrently; E2E_SERIAL=1 runs them one by one.
+    serial: bool
+
+
+def load_config() -> Config:
+    base_url = os.environ.get("BASE_URL", "http://localhost:8080").rstrip("/")
+    api_base_url = os.environ.get("API_BASE_URL", "").rstrip("/")
+    if not api_base_url:
+        api_base_url = base_url if base_url.endswith("/api/v1") else f"{base_url}/api/v1"
+    return Config(
+        base_url=base_url,
+        api_base_url=api_base_url,
+        api_token=os.environ.get("API_TOKEN", "change-me"),
+        minio_endpoint=os.environ.get("E2E_MINIO_ENDPOINT", "http://minio:9000"),
+        azurite_endpoint=os.environ.get("E2E_AZURITE_ENDPOINT", "http://azurite:10000/devstoreaccount1"),
+        # rclone's GCS endpoint handling drops /storage/v1; add a second v1 to keep /storage/v1/b.
+        gcs_endpoint=os.environ.get("E2E_GCS_ENDPOINT", "http://fake-gcs-server:4443/storage/v1/v1"),
+        gcs_iam_required=_env_flag("E2E_GCS_IAM"),
+        serial=_env_flag("E2E_SERIAL"),
+    )
 
 
-BASE_URL = os.environ.get("BASE_URL", "http://localhost:8080").rstrip("/")
-API_BASE_URL = os.environ.get("API_BASE_URL", "").rstrip("/")
-if not API_BASE_URL:
-    API_BASE_URL = BASE_URL if BASE_URL.endswith("/api/v1") else f"{BASE_URL}/api/v1"
-API_TOKEN = os.environ.get("API_TOKEN", "change-me")
-MINIO_ENDPOINT = os.environ.get("E2E_MINIO_ENDPOINT", "http://minio:9000")
-AZURITE_ENDPOINT = os.environ.get("E2E_AZURITE_ENDPOINT", "http://azurite:10000/devstoreaccount1")
-# rclone's GCS endpoint handling drops /storage/v1; add a second v1 to keep /storage/v1/b.
-GCS_ENDPOINT = os.environ.get("E2E_GCS_ENDPOINT", "http://fake-gcs-server:4443/storage/v1/v1")
+CFG = load_config()
+# Split once; every request only needs the path prefix appended.
+_API_SCHEME, _API_NETLOC, _API_PATH, _, _ = urllib.parse.urlsplit(CFG.api_base_url)
+_BASE_HEADERS = {"X-Api-Token": CFG.api_token}
+HELLO_KEY = "hello.txt"
+_HELLO_KEY_QUOTED = urllib.parse.quote(HELLO_KEY)
 
 
 class HTTPFailure(RuntimeError):
@@ -26,7 +67,7 @@ class HTTPFailure(RuntimeError):
         method: str,
         path: str,
         *,
-        headers: dict[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
         body_text: str | None = None,
         error_code: str | None = None,
         normalized_code: str | None = None,
@@ -38,7 +79,7 @@ class HTTPFailure(RuntimeError):
         self.status = status
         self.method = method
         self.path = path
-        self.headers = headers or {}
+        self._raw_headers = headers
         self.body_text = body_text
         self.error_code = error_code
         self.normalized_code = normalized_code
@@ -46,21 +87,68 @@ class HTTPFailure(RuntimeError):
         self.retry_after = retry_after
         self.request_id = request_id
 
+    @functools.cached_property
+    def headers(self) -> dict[str, str]:
+        if self._raw_headers is None:
+            return {}
+        return {k: v for k, v in self._raw_headers.items()}
+
+
+_SCENARIO: contextvars.ContextVar[str] = contextvars.ContextVar("scenario", default="")
+_LOG_LOCK = threading.Lock()
+
 
 def log(msg: str) -> None:
-    print(msg, flush=True)
+    # Prefix every line with the scenario name so concurrent scenarios stay readable.
+    scenario = _SCENARIO.get()
+    if scenario:
+        msg = "\n".join(f"[{scenario}] {line}" if line else line for line in msg.split("\n"))
+    with _LOG_LOCK:
+        print(msg, flush=True)
 
 
-def sleep_backoff(base_s: float, attempt: int, factor: float = 1.3, max_s: float = 5.0) -> float:
-    # attempt starts at 1
+def sleep_backoff(base_s: float, prev_sleep: float, factor: float = 3.0, max_s: float = 5.0) -> float:
+    # Decorrelated jitter: spread retries over [base, prev*factor] so concurrent retriers
+    # don't hammer a recovering backend in lockstep.
     try:
-        return min(max_s, base_s * (factor ** max(0, attempt - 1)))
+        return min(max_s, random.uniform(base_s, max(base_s, prev_sleep) * factor))
     except Exception:
         return base_s
 
 
-def retry(what: str, fn, *, attempts: int = 12, base_delay_s: float = 1.0):
+def _retry_after_s(e: Exception) -> float | None:
+    if not isinstance(e, HTTPFailure) or not e.retry_after:
+        return None
+    try:
+        return float(int(e.retry_after.strip()))
+    except ValueError:
+        # HTTP-date form is not used by the API; ignore it.
+        return None
+
+
+# Compact separators keep request bodies small. Passing separators= to json.dumps() would
+# build a new encoder on every call, so the configured encoder is kept at module level.
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def encode_json(obj: object) -> bytes:
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+def _is_permanent_failure(e: Exception) -> bool:
+    # Give up early only when the server flags the error as non-retryable. A bare 4xx is not
+    # enough: e.g. POST /profiles/{id}/test answers 400 test_failed without normalizedError
+    # while an emulator is still starting.
+    if not isinstance(e, HTTPFailure) or e.normalized_retryable is not False:
+        return False
+    # 404/409 stay retryable: buckets and objects are eventually consistent on the emulators.
+    return 400 <= e.status < 500 and e.status not in (404, 409)
+
+
+def retry(what: str, fn, *, attempts: int = 12, base_delay_s: float = 1.0, budget_s: float = 30.0):
     last_err: Exception | None = None
+    prev_sleep = base_delay_s
+    deadline: float | None = None
     for i in range(1, attempts + 1):
         try:
             return fn()
@@ -68,26 +156,126 @@ def retry(what: str, fn, *, attempts: int = 12, base_delay_s: float = 1.0):
             last_err = e
             if i >= attempts:
                 break
+            if _is_permanent_failure(e):
+                log(f"{what} failed with a non-retryable error (attempt {i}/{attempts}): {e}")
+                break
+            # The budget starts at the first failure, so an attempt that runs into the 30s
+            # request timeout does not use up the budget before any retry happens.
+            if deadline is None:
+                deadline = time.monotonic() + budget_s
+            prev_sleep = sleep_backoff(base_delay_s, prev_sleep)
+            delay = prev_sleep
+            server_delay = _retry_after_s(e)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+            if time.monotonic() + delay > deadline:
+                log(f"{what} failed (attempt {i}/{attempts}), retry budget of {budget_s:.0f}s exhausted: {e}")
+                break
             log(f"{what} failed (attempt {i}/{attempts}): {e}")
-            time.sleep(sleep_backoff(base_delay_s, i))
+            time.sleep(delay)
     if last_err is None:
         raise RuntimeError(f"{what} failed")
     raise last_err
 
 
+# One keep-alive connection per (scheme, host) and thread, so the sequential API calls
+# in a scenario reuse the TCP (and TLS) session instead of reconnecting every time.
+# http.client connections are not thread-safe, hence the thread-local pools.
+_POOLS = threading.local()
+_ALL_CONNECTIONS: list[http.client.HTTPConnection] = []
+_ALL_CONNECTIONS_LOCK = threading.Lock()
+
+
+def _connection(scheme: str, netloc: str, timeout_s: int) -> http.client.HTTPConnection:
+    pool = getattr(_POOLS, "connections", None)
+    if pool is None:
+        pool = _POOLS.connections = {}
+    key = (scheme, netloc)
+    conn = pool.get(key)
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=timeout_s, context=ssl.create_default_context())
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=timeout_s)
+        pool[key] = conn
+        with _ALL_CONNECTIONS_LOCK:
+            _ALL_CONNECTIONS.append(conn)
+    conn.timeout = timeout_s
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout_s)
+    return conn
+
+
+def close_connections() -> None:
+    with _ALL_CONNECTIONS_LOCK:
+        for conn in _ALL_CONNECTIONS:
+            conn.close()
+        _ALL_CONNECTIONS.clear()
+
+
+atexit.register(close_connections)
+
+
+def _send(
+    method: str,
+    target: str,
+    *,
+    data: bytes | list[bytes] | None,
+    headers: dict[str, str],
+    timeout_s: int,
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    conn = _connection(_API_SCHEME, _API_NETLOC, timeout_s)
+    # A pooled socket may have been closed by the server while idle; retry once on a fresh one.
+    while True:
+        reused = conn.sock is not None
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            continue
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        return resp.status, resp.headers, body
+
+
+_REQUEST_ID_HEADERS = frozenset({"x-request-id", "x-amzn-requestid"})
+
+
+def _error_headers(msg: http.client.HTTPMessage) -> tuple[str | None, str | None]:
+    # One pass over the headers instead of a case-insensitive scan per lookup.
+    # X-Request-Id wins over the S3-style X-Amzn-Requestid when both are present.
+    retry_after = None
+    request_id = None
+    for key, value in msg.items():
+        lower = key.lower()
+        if lower == "retry-after":
+            if retry_after is None:
+                retry_after = value
+        elif lower in _REQUEST_ID_HEADERS and (request_id is None or lower == "x-request-id"):
+            request_id = value
+    return retry_after, request_id
+
+
 def _request(
     method: str,
     path: str,
     *,
     profile_id: str | None = None,
     json_body: object | None = None,
-    body: bytes | None = None,
+    body: bytes | list[bytes] | None = None,
     content_type: str | None = None,
     accept: str | None = None,
     timeout_s: int = 30,
-) -> tuple[int, dict[str, str], bytes]:
-    url = f"{API_BASE_URL}{path}"
-    headers = {"X-Api-Token": API_TOKEN}
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    target = _API_PATH + path
+    headers = _BASE_HEADERS.copy()
     if profile_id:
         headers["X-Profile-Id"] = profile_id
     if accept:
@@ -95,85 +283,104 @@ def _request(
 
     data = None
     if json_body is not None:
-        data = json.dumps(json_body).encode("utf-8")
+        data = encode_json(json_body)
         headers["Content-Type"] = "application/json"
     elif body is not None:
         data = body
         if content_type:
             headers["Content-Type"] = content_type
+        if isinstance(body, list):
+            # Segment lists are written to the socket one by one; a known length avoids
+            # chunked encoding, and a list (unlike a generator) can be resent on reconnect.
+            headers["Content-Length"] = str(sum(len(segment) for segment in body))
 
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            resp_body = resp.read()
-            resp_headers = {k: v for k, v in resp.headers.items()}
-            return resp.status, resp_headers, resp_body
-    except urllib.error.HTTPError as e:
-        err_body = e.read()
-        resp_headers = {k: v for k, v in e.headers.items()} if getattr(e, 'headers', None) is not None else {}
-        retry_after = resp_headers.get('Retry-After')
-        request_id = resp_headers.get('X-Request-Id') or resp_headers.get('X-Request-ID') or resp_headers.get('X-Amzn-Requestid')
-
-        decoded = ''
-        try:
-            decoded = err_body.decode('utf-8', errors='replace')
-        except Exception:
-            decoded = repr(err_body)
-
-        err_code = None
-        norm_code = None
-        norm_retryable = None
-        try:
-            parsed = json.loads(decoded)
-            if isinstance(parsed, dict) and isinstance(parsed.get('error'), dict):
-                er = parsed.get('error', {})
-                err_code = er.get('code')
-                norm = er.get('normalizedError')
-                if isinstance(norm, dict):
-                    norm_code = norm.get('code')
-                    norm_retryable = norm.get('retryable')
-        except Exception:
-            pass
-
-        log(f"HTTP {e.code} {method} {path}")
-        if request_id:
-            log(f"  X-Request-Id: {request_id}")
-        if retry_after:
-            log(f"  Retry-After: {retry_after}")
-        if err_code:
-            log(f"  ErrorResponse.code: {err_code}")
-        if norm_code is not None:
-            log(f"  ErrorResponse.normalizedError: {norm_code} retryable={norm_retryable}")
-        if decoded:
-            # Keep the body readable but avoid flooding logs.
-            clipped = decoded if len(decoded) <= 4000 else decoded[:4000] + "...<clipped>"
-            log(f"  Body: {clipped}")
-
-        raise HTTPFailure(
-            e.code,
-            method,
-            path,
-            headers=resp_headers,
-            body_text=decoded,
-            error_code=err_code,
-            normalized_code=norm_code,
-            normalized_retryable=norm_retryable,
-            retry_after=retry_after,
-            request_id=request_id,
-        )
-    except urllib.error.URLError as e:
+        status, msg, resp_body = _send(method, target, data=data, headers=headers, timeout_s=timeout_s)
+    except (OSError, http.client.HTTPException) as e:
         raise RuntimeError(f"Network error {method} {path}: {e}")
 
+    # Hand back the HTTPMessage itself: it already supports case-insensitive get(),
+    # and none of the wrappers look at success headers.
+    if 200 <= status < 300:
+        return status, msg, resp_body
+
+    # Read the few headers we need straight off the message; HTTPFailure.headers
+    # only builds the full dict if someone asks for it.
+    err_body = resp_body
+    retry_after, request_id = _error_headers(msg)
+
+    decoded = ''
+    try:
+        decoded = err_body.decode('utf-8', errors='replace')
+    except Exception:
+        decoded = repr(err_body)
+
+    err_code = None
+    norm_code = None
+    norm_retryable = None
+    # Proxies answer 5xx with HTML/plain text; only hand JSON-looking bodies to the parser.
+    stripped = decoded.lstrip()
+    try:
+        parsed = json.loads(stripped) if stripped.startswith('{') else None
+        if isinstance(parsed, dict) and isinstance(parsed.get('error'), dict):
+            er = parsed.get('error', {})
+            err_code = er.get('code')
+            norm = er.get('normalizedError')
+            if isinstance(norm, dict):
+                norm_code = norm.get('code')
+                norm_retryable = norm.get('retryable')
+    except Exception:
+        pass
+
+    log(f"HTTP {status} {method} {path}")
+    if request_id:
+        log(f"  X-Request-Id: {request_id}")
+    if retry_after:
+        log(f"  Retry-After: {retry_after}")
+    if err_code:
+        log(f"  ErrorResponse.code: {err_code}")
+    if norm_code is not None:
+        log(f"  ErrorResponse.normalizedError: {norm_code} retryable={norm_retryable}")
+    if decoded:
+        # Keep the body readable but avoid flooding logs.
+        clipped = decoded if len(decoded) <= 4000 else decoded[:4000] + "...<clipped>"
+        log(f"  Body: {clipped}")
+
+    raise HTTPFailure(
+        status,
+        method,
+        path,
+        headers=msg,
+        body_text=decoded,
+        error_code=err_code,
+        normalized_code=norm_code,
+        normalized_retryable=norm_retryable,
+        retry_after=retry_after,
+        request_id=request_id,
+    )
+
 
 def request_json(
-    method: str, path: str, *, profile_id: str | None = None, json_body: object | None = None
+    method: str,
+    path: str,
+    *,
+    profile_id: str | None = None,
+    json_body: object | None = None,
+    json_bytes: bytes | None = None,
 ) -> object:
-    status, headers, body = _request(method, path, profile_id=profile_id, json_body=json_body, accept="application/json")
+    # json_bytes is an already-encoded body (see encode_json) for payloads sent more than once.
+    if json_bytes is not None:
+        status, headers, body = _request(
+            method, path, profile_id=profile_id, body=json_bytes, content_type="application/json", accept="application/json"
+        )
+    else:
+        status, headers, body = _request(method, path, profile_id=profile_id, json_body=json_body, accept="application/json")
     if status < 200 or status >= 300:
         raise RuntimeError(f"Unexpected HTTP {status} {method} {path}")
     if not body:
         return {}
-    return json.loads(body.decode("utf-8"))
+    # json.loads detects the UTF encoding itself; no need for a decoded copy of the body.
+    return json.loads(body)
 
 
 def request_bytes(method: str, path: str, *, profile_id: str | None = None) -> bytes:
@@ -188,28 +395,47 @@ def request_text(method: str, path: str, *, profile_id: str | None = None) -> st
     if status < 200 or status >= 300:
         raise RuntimeError(f"Unexpected HTTP {status} {method} {path}")
     try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
         return body.decode("utf-8", errors="replace")
-    except Exception:
-        return repr(body)
 
-def multipart_form(files: list[tuple[str, bytes]]) -> tuple[bytes, str]:
+_CRLF = b"\r\n"
+_FILE_PART_DISPOSITION = b'Content-Disposition: form-data; name="files"; filename="'
+_FILE_PART_HEADER_END = b'"\r\nContent-Type: application/octet-stream\r\n\r\n'
+
+
+def multipart_form_parts(files: list[tuple[str, bytes]]) -> tuple[list[bytes], str]:
+    """Return the multipart body as segments that reference each file's content without copying it."""
     boundary = uuid.uuid4().hex
-    parts: list[bytes] = []
+    delimiter = f"--{boundary}\r\n".encode("ascii")
+    # Four segments per file plus the closing delimiter; fill by index instead of growing a list.
+    parts: list[bytes] = [b""] * (4 * len(files) + 1)
 
+    i = 0
     for filename, content in files:
-        parts.append(f"--{boundary}\r\n".encode("utf-8"))
-        parts.append(
-            (
-                f"Content-Disposition: form-data; name=\"files\"; filename=\"{filename}\"\r\n"
-                "Content-Type: application/octet-stream\r\n\r\n"
-            ).encode("utf-8")
-        )
-        parts.append(content)
-        parts.append(b"\r\n")
+        parts[i] = delimiter
+        parts[i + 1] = _FILE_PART_DISPOSITION + filename.encode("utf-8") + _FILE_PART_HEADER_END
+        parts[i + 2] = content
+        parts[i + 3] = _CRLF
+        i += 4
+
+    parts[i] = f"--{boundary}--\r\n".encode("ascii")
+    return parts, f"multipart/form-data; boundary={boundary}"
+
+
+def multipart_form(files: list[tuple[str, bytes]]) -> tuple[bytes, str]:
+    parts, content_type = multipart_form_parts(files)
+    return b"".join(parts), content_type
+
+
+# Long-lived workers keep their thread-local keep-alive connections between gather() calls.
+_GATHER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="e2e-gather")
+
 
-    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
-    body = b"".join(parts)
-    return body, f"multipart/form-data; boundary={boundary}"
+def gather(*fns):
+    """Run independent calls concurrently and return their results in call order."""
+    futures = [_GATHER_POOL.submit(contextvars.copy_context().run, fn) for fn in fns]
+    return [f.result() for f in futures]
 
 
 def wait_for_server(timeout_s: int = 120) -> None:
@@ -227,8 +453,14 @@ def wait_for_server(timeout_s: int = 120) -> None:
 
 
 def poll_job(job_id: str, *, profile_id: str) -> None:
-    deadline = time.time() + 180
-    while time.time() < deadline:
+    # Poll quickly right after a status change, then back off to max_delay_s: short jobs
+    # are detected early without hammering the API while a long job runs.
+    deadline = time.monotonic() + 180
+    min_delay_s = 0.1
+    max_delay_s = 2.0
+    delay = min_delay_s
+    last_status = None
+    while time.monotonic() < deadline:
         job = request_json("GET", f"/jobs/{job_id}", profile_id=profile_id)
         status = job.get("status")
         if status == "succeeded":
@@ -247,7 +479,11 @@ def poll_job(job_id: str, *, profile_id: str) -> None:
                 log(f"(warn) failed to fetch job logs: {e}")
 
             raise RuntimeError(f"Job {job_id} ended with status={status}: {job.get('error')}")
-        time.sleep(1)
+        if status != last_status:
+            last_status = status
+            delay = min_delay_s
+        time.sleep(delay)
+        delay = min(max_delay_s, delay * 1.5)
     raise RuntimeError(f"Job {job_id} did not finish within 180s")
 
 
@@ -260,14 +496,8 @@ def exercise_bucket_policy(profile_id: str, bucket: str) -> None:
       - DELETE
       - GET (expect exists=false)
     """
-    log("Bucket policy: GET (initial)")
-    initial = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
-    if not isinstance(initial, dict):
-        raise RuntimeError(f"Unexpected bucket policy response: {initial!r}")
-    if initial.get("bucket") != bucket:
-        raise RuntimeError(f"Unexpected bucket in policy response: {initial!r}")
-    if "exists" not in initial:
-        raise RuntimeError(f"Missing 'exists' in policy response: {initial!r}")
+    policy_path = f"/buckets/{bucket}/policy"
+    validate_path = f"{policy_path}/validate"
 
     policy_doc = {
         "Version": "2012-10-17",
@@ -282,24 +512,37 @@ def exercise_bucket_policy(profile_id: str, bucket: str) -> None:
         ],
     }
 
-    log("Bucket policy: VALIDATE (static)")
-    v = request_json("POST", f"/buckets/{bucket}/policy/validate", profile_id=profile_id, json_body={"policy": policy_doc})
+    # Encoded once: the same body is sent to VALIDATE and PUT.
+    policy_body = encode_json({"policy": policy_doc})
+
+    # Static validation doesn't touch the bucket, so it can overlap the initial GET.
+    log("Bucket policy: GET (initial) + VALIDATE (static)")
+    initial, v = gather(
+        lambda: request_json("GET", policy_path, profile_id=profile_id),
+        lambda: request_json("POST", validate_path, profile_id=profile_id, json_bytes=policy_body),
+    )
+    if not isinstance(initial, dict):
+        raise RuntimeError(f"Unexpected bucket policy response: {initial!r}")
+    if initial.get("bucket") != bucket:
+        raise RuntimeError(f"Unexpected bucket in policy response: {initial!r}")
+    if "exists" not in initial:
+        raise RuntimeError(f"Missing 'exists' in policy response: {initial!r}")
     if isinstance(v, dict) and v.get("ok") is False:
         raise RuntimeError(f"Static validation failed: {v!r}")
 
     log("Bucket policy: PUT")
-    request_json("PUT", f"/buckets/{bucket}/policy", profile_id=profile_id, json_body={"policy": policy_doc})
+    request_json("PUT", policy_path, profile_id=profile_id, json_bytes=policy_body)
 
     log("Bucket policy: GET (after put)")
-    after_put = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
+    after_put = request_json("GET", policy_path, profile_id=profile_id)
     if not isinstance(after_put, dict) or after_put.get("exists") is not True:
         raise RuntimeError(f"Policy should exist after PUT: {after_put!r}")
 
     log("Bucket policy: DELETE")
-    request_json("DELETE", f"/buckets/{bucket}/policy", profile_id=profile_id)
+    request_json("DELETE", policy_path, profile_id=profile_id)
 
     log("Bucket policy: GET (after delete)")
-    after_del = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
+    after_del = request_json("GET", policy_path, profile_id=profile_id)
     if not isinstance(after_del, dict) or after_del.get("exists") is not False:
         raise RuntimeError(f"Policy should not exist after DELETE: {after_del!r}")
 
@@ -317,10 +560,8 @@ def exercise_azure_container_policy(profile_id: str, bucket: str) -> None:
       - DELETE (reset)
       - GET (verify private + empty)
     """
-    log("Azure container policy: GET (initial)")
-    initial = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
-    if not isinstance(initial, dict):
-        raise RuntimeError(f"Unexpected bucket policy response: {initial!r}")
+    policy_path = f"/buckets/{bucket}/policy"
+    validate_path = f"{policy_path}/validate"
 
     policy_doc = {
         "publicAccess": "container",
@@ -332,16 +573,23 @@ def exercise_azure_container_policy(profile_id: str, bucket: str) -> None:
         ],
     }
 
-    log("Azure container policy: VALIDATE (static)")
-    v = request_json("POST", f"/buckets/{bucket}/policy/validate", profile_id=profile_id, json_body={"policy": policy_doc})
+    policy_body = encode_json({"policy": policy_doc})
+
+    log("Azure container policy: GET (initial) + VALIDATE (static)")
+    initial, v = gather(
+        lambda: request_json("GET", policy_path, profile_id=profile_id),
+        lambda: request_json("POST", validate_path, profile_id=profile_id, json_bytes=policy_body),
+    )
+    if not isinstance(initial, dict):
+        raise RuntimeError(f"Unexpected bucket policy response: {initial!r}")
     if isinstance(v, dict) and v.get("ok") is False:
         raise RuntimeError(f"Static validation failed: {v!r}")
 
     log("Azure container policy: PUT")
-    request_json("PUT", f"/buckets/{bucket}/policy", profile_id=profile_id, json_body={"policy": policy_doc})
+    request_json("PUT", policy_path, profile_id=profile_id, json_bytes=policy_body)
 
     log("Azure container policy: GET (after put)")
-    after_put = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
+    after_put = request_json("GET", policy_path, profile_id=profile_id)
     if not isinstance(after_put, dict) or after_put.get("exists") is not True:
         raise RuntimeError(f"Policy should exist after PUT: {after_put!r}")
     pol = after_put.get("policy")
@@ -354,10 +602,10 @@ def exercise_azure_container_policy(profile_id: str, bucket: str) -> None:
         raise RuntimeError(f"Expected stored access policy e2e-read: {after_put!r}")
 
     log("Azure container policy: RESET (DELETE)")
-    request_json("DELETE", f"/buckets/{bucket}/policy", profile_id=profile_id)
+    request_json("DELETE", policy_path, profile_id=profile_id)
 
     log("Azure container policy: GET (after reset)")
-    after_reset = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
+    after_reset = request_json("GET", policy_path, profile_id=profile_id)
     pol2 = after_reset.get("policy") if isinstance(after_reset, dict) else None
     if not isinstance(pol2, dict):
         raise RuntimeError(f"Expected policy object after reset: {after_reset!r}")
@@ -378,7 +626,10 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
     NOTE: Some fake-gcs-server versions/environments may not support the /iam endpoint.
     In that case we skip unless E2E_GCS_IAM=1 is set.
     """
-    required = os.environ.get("E2E_GCS_IAM", "").lower() in ("1", "true", "yes", "y")
+    policy_path = f"/buckets/{bucket}/policy"
+    validate_path = f"{policy_path}/validate"
+
+    required = CFG.gcs_iam_required
 
     def skip(where: str, e: Exception) -> None:
         if required:
@@ -392,7 +643,7 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
 
     log("GCS IAM policy: GET (initial)")
     try:
-        initial = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
+        initial = request_json("GET", policy_path, profile_id=profile_id)
     except Exception as e:
         skip("get", e)
         return
@@ -404,17 +655,13 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
     if not isinstance(original, dict):
         original = {"version": 1, "bindings": []}
 
-    # Deep-copy for safe mutation.
-    try:
-        modified = json.loads(json.dumps(original))
-    except Exception:
-        modified = {"version": 1, "bindings": []}
-
-    if not isinstance(modified, dict):
-        modified = {"version": 1, "bindings": []}
-
-    bindings = modified.get("bindings")
-    if not isinstance(bindings, list):
+    # Copy only what is mutated below (the bindings list, its binding dicts and member
+    # lists) so `original` stays intact for the restore step.
+    modified = dict(original)
+    bindings = original.get("bindings")
+    if isinstance(bindings, list):
+        bindings = [dict(b) if isinstance(b, dict) else b for b in bindings]
+    else:
         bindings = []
 
     # Ensure public read binding (allUsers) exists.
@@ -426,8 +673,7 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
         if b.get("role") != role:
             continue
         members = b.get("members")
-        if not isinstance(members, list):
-            members = []
+        members = list(members) if isinstance(members, list) else []
         if "allUsers" not in members:
             members.append("allUsers")
         b["members"] = members
@@ -439,9 +685,11 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
     if "version" not in modified:
         modified["version"] = 1
 
+    policy_body = encode_json({"policy": modified})
+
     log("GCS IAM policy: VALIDATE (static)")
     try:
-        v = request_json("POST", f"/buckets/{bucket}/policy/validate", profile_id=profile_id, json_body={"policy": modified})
+        v = request_json("POST", validate_path, profile_id=profile_id, json_bytes=policy_body)
         if isinstance(v, dict) and v.get("ok") is False:
             raise RuntimeError(f"Static validation failed: {v!r}")
     except Exception as e:
@@ -450,14 +698,14 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
 
     log("GCS IAM policy: PUT")
     try:
-        request_json("PUT", f"/buckets/{bucket}/policy", profile_id=profile_id, json_body={"policy": modified})
+        request_json("PUT", policy_path, profile_id=profile_id, json_bytes=policy_body)
     except Exception as e:
         skip("put", e)
         return
 
     log("GCS IAM policy: GET (after put)")
     try:
-        after = request_json("GET", f"/buckets/{bucket}/policy", profile_id=profile_id)
+        after = request_json("GET", policy_path, profile_id=profile_id)
     except Exception as e:
         skip("get-after-put", e)
         return
@@ -469,7 +717,7 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
     # Restore original policy to leave the emulator in a clean state.
     log("GCS IAM policy: RESTORE")
     try:
-        request_json("PUT", f"/buckets/{bucket}/policy", profile_id=profile_id, json_body={"policy": original})
+        request_json("PUT", policy_path, profile_id=profile_id, json_body={"policy": original})
     except Exception as e:
         # Restore is best-effort for emulators.
         if required:
@@ -479,7 +727,7 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
     # DELETE should be rejected by API (we deliberately don't support delete for GCS IAM).
     log("GCS IAM policy: DELETE (expected to fail)")
     try:
-        request_json("DELETE", f"/buckets/{bucket}/policy", profile_id=profile_id)
+        request_json("DELETE", policy_path, profile_id=profile_id)
         raise RuntimeError("Expected GCS IAM delete to fail")
     except HTTPFailure as e:
         if e.error_code != "bucket_policy_delete_unsupported":
@@ -488,6 +736,7 @@ def exercise_gcs_iam_policy(profile_id: str, bucket: str) -> None:
     log("GCS IAM policy OK")
 
 def run_scenario(name: str, create_profile_payload: dict, bucket: str, endpoint_note: str) -> None:
+    _SCENARIO.set(name)
     log(f"\n=== Scenario: {name} ===")
     log(f"Profile endpoint hint: {endpoint_note}")
 
@@ -500,13 +749,16 @@ def run_scenario(name: str, create_profile_payload: dict, bucket: str, endpoint_
         lambda: request_json("POST", f"/profiles/{profile_id}/test"),
         attempts=15,
         base_delay_s=1.0,
+        budget_s=90.0,
     )
     if not test.get("ok"):
         raise RuntimeError(f"Profile test failed: {test}")
     log("Profile test OK")
 
+    create_bucket_body = encode_json({"name": bucket})
+
     def ensure_bucket() -> None:
-        request_json("POST", "/buckets", profile_id=profile_id, json_body={"name": bucket})
+        request_json("POST", "/buckets", profile_id=profile_id, json_bytes=create_bucket_body)
         buckets = request_json("GET", "/buckets", profile_id=profile_id)
         if not isinstance(buckets, list):
             raise RuntimeError(f"Unexpected /buckets response: {buckets!r}")
@@ -529,9 +781,8 @@ def run_scenario(name: str, create_profile_payload: dict, bucket: str, endpoint_
     upload_id = upload["uploadId"]
     log(f"Created upload session id={upload_id}")
 
-    hello_key = "hello.txt"
     hello_content = f"hello from {name}\n".encode("utf-8")
-    mp_body, mp_type = multipart_form([(hello_key, hello_content)])
+    mp_body, mp_type = multipart_form_parts([(HELLO_KEY, hello_content)])
     _request(
         "POST",
         f"/uploads/{upload_id}/files",
@@ -555,7 +806,7 @@ def run_scenario(name: str, create_profile_payload: dict, bucket: str, endpoint_
     def download_object() -> bytes:
         return request_bytes(
             "GET",
-            f"/buckets/{bucket}/objects/download?key={urllib.parse.quote(hello_key)}",
+            f"/buckets/{bucket}/objects/download?key={_HELLO_KEY_QUOTED}",
             profile_id=profile_id,
         )
 
@@ -568,13 +819,15 @@ def run_scenario(name: str, create_profile_payload: dict, bucket: str, endpoint_
 def main() -> int:
     wait_for_server()
 
+    scenarios: list[tuple[str, dict, str, str]] = []
+
     # MinIO (S3 compatible)
-    run_scenario(
+    scenarios.append((
         "minio",
         {
             "provider": "s3_compatible",
             "name": "e2e-minio",
-            "endpoint": MINIO_ENDPOINT,
+            "endpoint": CFG.minio_endpoint,
             "region": "us-east-1",
             "accessKeyId": "minioadmin",
             "secretAccessKey": "minioadmin",
@@ -582,32 +835,32 @@ def main() -> int:
             "preserveLeadingSlash": False,
             "tlsInsecureSkipVerify": False,
         },
-        bucket="e2e-minio",
-        endpoint_note=MINIO_ENDPOINT,
-    )
+        "e2e-minio",
+        CFG.minio_endpoint,
+    ))
 
     # Azurite (Azure Blob)
     # Well-known Azurite dev account key (devstoreaccount1).
     # https://learn.microsoft.com/en-us/azure/storage/common/storage-configure-connection-string
     azurite_key = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
-    run_scenario(
+    scenarios.append((
         "azurite",
         {
             "provider": "azure_blob",
             "name": "e2e-azurite",
             "accountName": "devstoreaccount1",
             "accountKey": azurite_key,
-            "endpoint": AZURITE_ENDPOINT,
+            "endpoint": CFG.azurite_endpoint,
             "useEmulator": True,
             "preserveLeadingSlash": False,
             "tlsInsecureSkipVerify": False,
         },
-        bucket="e2e-azurite",
-        endpoint_note=AZURITE_ENDPOINT,
-    )
+        "e2e-azurite",
+        CFG.azurite_endpoint,
+    ))
 
     # fake-gcs-server (GCP GCS)
-    run_scenario(
+    scenarios.append((
         "fake-gcs",
         {
             "provider": "gcp_gcs",
@@ -616,13 +869,28 @@ def main() -> int:
             # (Value is arbitrary for the fake-gcs-server emulator.)
             "projectNumber": "1234567890",
             "anonymous": True,
-            "endpoint": GCS_ENDPOINT,
+            "endpoint": CFG.gcs_endpoint,
             "preserveLeadingSlash": False,
             "tlsInsecureSkipVerify": False,
         },
-        bucket="e2e-fake-gcs",
-        endpoint_note=GCS_ENDPOINT,
-    )
+        "e2e-fake-gcs",
+        CFG.gcs_endpoint,
+    ))
+
+    failed: list[str] = []
+    first_exc: Exception | None = None
+    with ThreadPoolExecutor(max_workers=1 if CFG.serial else len(scenarios)) as pool:
+        futures = [(args[0], pool.submit(run_scenario, *args)) for args in scenarios]
+        for name, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                # Keep the type and stack in the CI log; str(e) alone can be as terse as "'id'".
+                log(f"Scenario {name} failed:\n{''.join(traceback.format_exception(e)).rstrip()}")
+                failed.append(name)
+                first_exc = first_exc or e
+    if failed:
+        raise RuntimeError(f"E2E scenarios failed: {', '.join(failed)}") from first_exc
 
     log("\nAll E2E scenarios passed")
     return 0
@@ -0,0 +1,126 @@
+import importlib.util
+import pathlib
+import sys
+import unittest
+from unittest import mock
+
+
+SCRIPT_PATH = pathlib.Path(__file__).with_name("runner.py")
+SPEC = importlib.util.spec_from_file_location("runner", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+def failure(status, *, retryable=None, retry_after=None):
+    return MODULE.HTTPFailure(
+        status,
+        "POST",
+        "/api/v1/profiles/p/test",
+        normalized_retryable=retryable,
+        retry_after=retry_after,
+    )
+
+
+class IsPermanentFailureTests(unittest.TestCase):
+    def test_client_errors_flagged_non_retryable_are_permanent(self):
+        for status in (400, 401, 403, 422):
+            self.assertTrue(MODULE._is_permanent_failure(failure(status, retryable=False)), status)
+
+    def test_status_alone_is_not_permanent(self):
+        # e.g. 400 test_failed from the profile test carries no normalizedError.
+        for status in (400, 401, 403, 422):
+            self.assertFalse(MODULE._is_permanent_failure(failure(status)), status)
+
+    def test_retryable_not_found_conflict_and_server_errors_are_not_permanent(self):
+        self.assertFalse(MODULE._is_permanent_failure(failure(400, retryable=True)))
+        self.assertFalse(MODULE._is_permanent_failure(failure(404, retryable=False)))
+        self.assertFalse(MODULE._is_permanent_failure(failure(409, retryable=False)))
+        self.assertFalse(MODULE._is_permanent_failure(failure(500, retryable=False)))
+        self.assertFalse(MODULE._is_permanent_failure(TimeoutError("timed out")))
+
+
+class RetryAfterTests(unittest.TestCase):
+    def test_parses_delay_seconds(self):
+        self.assertEqual(MODULE._retry_after_s(failure(429, retry_after=" 3 ")), 3.0)
+
+    def test_ignores_missing_and_http_date_values(self):
+        self.assertIsNone(MODULE._retry_after_s(failure(429)))
+        self.assertIsNone(MODULE._retry_after_s(failure(429, retry_after="Wed, 21 Oct 2026 07:28:00 GMT")))
+        self.assertIsNone(MODULE._retry_after_s(RuntimeError("boom")))
+
+
+class RetryTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        patches = [
+            mock.patch.object(MODULE.time, "monotonic", lambda: self.now),
+            mock.patch.object(MODULE.time, "sleep", self.advance),
+            mock.patch.object(MODULE, "sleep_backoff", lambda base_s, prev_sleep: 1.0),
+            mock.patch.object(MODULE, "log", lambda msg: None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def failing(self, exc, *, takes_s=0.0):
+        calls = []
+
+        def fn():
+            calls.append(self.now)
+            self.advance(takes_s)
+            raise exc
+
+        return fn, calls
+
+    def test_budget_counts_from_the_first_failure(self):
+        # Each attempt runs into a 30s timeout; the first one must not exhaust a 30s budget.
+        fn, calls = self.failing(TimeoutError("timed out"), takes_s=30.0)
+
+        with self.assertRaises(TimeoutError):
+            MODULE.retry("op", fn, attempts=10, budget_s=30.0)
+
+        self.assertEqual(calls, [0.0, 31.0])
+
+    def test_stops_when_the_next_sleep_would_pass_the_budget(self):
+        fn, calls = self.failing(failure(503))
+
+        with self.assertRaises(MODULE.HTTPFailure):
+            MODULE.retry("op", fn, attempts=10, budget_s=5.0)
+
+        self.assertEqual(len(calls), 6)
+
+    def test_server_retry_after_extends_the_delay(self):
+        fn, calls = self.failing(failure(429, retry_after="4"))
+
+        with self.assertRaises(MODULE.HTTPFailure):
+            MODULE.retry("op", fn, attempts=3, budget_s=60.0)
+
+        self.assertEqual(calls, [0.0, 4.0, 8.0])
+
+    def test_permanent_failure_is_not_retried(self):
+        fn, calls = self.failing(failure(403, retryable=False))
+
+        with self.assertRaises(MODULE.HTTPFailure):
+            MODULE.retry("op", fn, attempts=10)
+
+        self.assertEqual(len(calls), 1)
+
+    def test_returns_first_success(self):
+        results = iter([failure(400), failure(400), "ok"])
+
+        def fn():
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.assertEqual(MODULE.retry("op", fn, attempts=5), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -87,6 +87,9 @@ bash "${ROOT}/scripts/validate_openapi.sh"
 echo "[check] release gate"
 bash "${ROOT}/scripts/check_release_gate.sh"
 
+echo "[check] e2e runner"
+python3 "${ROOT}/e2e/runner/runner_test.py"
+
 echo "[check] github workflows"
 bash "${ROOT}/scripts/check_github_workflows.sh"
 
@@ -238,6 +241,7 @@ cleanup_third_party_notice_snapshots() {
 }
 trap cleanup_third_party_notice_snapshots EXIT
 
+python3 "${ROOT}/scripts/generate_third_party_notices_test.py"
 third_party_notice_snapshot >"${third_party_notice_before}"
 python3 "${ROOT}/scripts/generate_third_party_notices.py"
 third_party_notice_snapshot >"${third_party_notice_after}"
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
+import io
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -23,9 +27,17 @@ MANUAL_LICENSES_DIR = REPO_ROOT / "third_party" / "licenses-manual"
 MANUAL_GO_LICENSES_DIR = MANUAL_LICENSES_DIR / "go"
 MANUAL_NPM_LICENSES_DIR = MANUAL_LICENSES_DIR / "npm"
 MANUAL_EXTERNAL_LICENSES_DIR = MANUAL_LICENSES_DIR / "external"
+GO_MOD_DIR_CACHE = REPO_ROOT / "third_party" / ".cache" / "go_mod_dirs.json"
+# License lookup is mostly directory listing and small reads; threads overlap that I/O.
+LICENSE_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+NPM_LOCK_ENTRY_RE = re.compile(r'"(node_modules/[^"]+)":\s*\{')
+NPM_LOCK_FIELDS = ("name", "version", "license", "licenses", "dev")
+SANITIZE_RE = re.compile(r"[^A-Za-z0-9._+-]")
 RCLONE_LICENSE_URL = "https://raw.githubusercontent.com/rclone/rclone/master/COPYING"
 
-LICENSE_RE = re.compile(r"^(licen[sc]e|copying|notice)(\..*)?$", re.I)
+# A license file is one of these names, bare or followed by any ".suffix" (case-insensitive).
+LICENSE_NAME_PREFIXES = ("license", "licence", "copying", "notice")
+LICENSE_NAME_DOTTED = tuple(prefix + "." for prefix in LICENSE_NAME_PREFIXES)
 
 LICENSE_PATTERNS = {
     "Apache-2.0": re.compile(r"Apache License\s*Version\s*2", re.I),
@@ -38,29 +50,59 @@ LICENSE_PATTERNS = {
     "CC-BY-4.0": re.compile(r"Creative Commons Attribution 4\.0", re.I),
 }
 
-MIT_PHRASE = re.compile(r"Permission is hereby granted, free of charge, to any person obtaining a copy", re.I)
-BSD_PHRASE = re.compile(r"Redistribution and use in source and binary forms", re.I)
-BSD_NEITHER = re.compile(r"Neither the name of", re.I)
+# Lowercase phrase every match of the corresponding LICENSE_PATTERNS entry starts with.
+# A substring test on the lowercased text rules out most patterns before any regex runs;
+# the regex is only needed to confirm the version.
+LICENSE_ANCHORS = {
+    "Apache-2.0": "apache license",
+    "MPL-2.0": "mozilla public license",
+    "GPL-3.0": "gnu general public license",
+    "GPL-2.0": "gnu general public license",
+    "LGPL": "gnu lesser general public license",
+    "ISC": "isc license",
+    "0BSD": "bsd zero clause license",
+    "CC-BY-4.0": "creative commons attribution 4.0",
+}
+
+# (name, anchor, bound search) built once so detect_license loops over a flat tuple.
+LICENSE_CHECKS = tuple(
+    (name, LICENSE_ANCHORS[name], pattern.search) for name, pattern in LICENSE_PATTERNS.items()
+)
+
+# Every marker above sits in the license header; the furthest one in third_party/licenses
+# is ~3.5 KiB in. Reading a bounded head skips most of the ~35 KiB GPL texts.
+LICENSE_HEAD_BYTES = 16 * 1024
+
+# These are fixed phrases, so a substring test is the whole check.
+MIT_PHRASE = "permission is hereby granted, free of charge, to any person obtaining a copy"
+BSD_PHRASE = "redistribution and use in source and binary forms"
+BSD_NEITHER = "neither the name of"
 
 
 def run(cmd: list[str], cwd: Path | None = None) -> str:
     return subprocess.check_output(cmd, cwd=str(cwd) if cwd else None, text=True)
 
 
+def run_bytes(cmd: list[str], cwd: Path | None = None) -> bytes:
+    # For output that goes straight to json.loads, which decodes UTF-8 bytes itself.
+    return subprocess.check_output(cmd, cwd=str(cwd) if cwd else None)
+
+
+def decode_json_stream(raw: bytes) -> list[dict]:
+    # `go ... -json` prints one indented object after another. Nested braces are
+    # indented, so "}\n{" only occurs between top-level objects; turning the stream
+    # into an array lets a single json.loads call parse all of it.
+    raw = raw.strip()
+    if not raw:
+        return []
+    return json.loads(b"[" + raw.replace(b"}\n{", b"},\n{") + b"]")
+
+
 def parse_go_modules() -> list[dict[str, str]]:
-    raw = run(["go", "list", "-m", "-json", "all"], cwd=BACKEND_DIR)
-    dec = json.JSONDecoder()
-    idx = 0
-    modules = []
-    while idx < len(raw):
-        while idx < len(raw) and raw[idx].isspace():
-            idx += 1
-        if idx >= len(raw):
-            break
-        obj, idx = dec.raw_decode(raw, idx)
-        modules.append(obj)
-
-    results: list[dict[str, str]] = []
+    modules = decode_json_stream(run_bytes(["go", "list", "-m", "-json", "all"], cwd=BACKEND_DIR))
+
+    mod_dirs = resolve_go_module_dirs(modules)
+    entries: list[tuple[str, str, str | None]] = []
     for mod in modules:
         if mod.get("Main"):
             continue
@@ -68,103 +110,194 @@ def parse_go_modules() -> list[dict[str, str]]:
         version = mod.get("Version")
         if not name or not version:
             continue
-        mod_dir = ensure_go_module_dir(name, version, mod.get("Dir"))
-        license_file = find_license_file(Path(mod_dir)) if mod_dir else None
-        license_id = "UNKNOWN"
-        license_name = ""
-        if license_file:
-            license_name = license_file.name
-            license_id = detect_license(license_file)
-        results.append(
-            {
-                "name": name,
-                "version": version,
-                "license": license_id,
-                "license_file": license_name,
-                "license_path": str(license_file) if license_file else "",
-            }
-        )
+        entries.append((name, version, mod_dirs.get(f"{name}@{version}")))
+
+    with ThreadPoolExecutor(max_workers=LICENSE_SCAN_WORKERS) as pool:
+        results = list(pool.map(resolve_go_license, entries))
     results.sort(key=lambda item: (item["name"], item["version"]))
     return results
 
 
-def ensure_go_module_dir(name: str, version: str, existing: str | None) -> str | None:
-    if existing and os.path.isdir(existing):
-        return existing
+def resolve_go_license(entry: tuple[str, str, str | None]) -> dict[str, str]:
+    name, version, mod_dir = entry
+    license_file = find_license_file(Path(mod_dir)) if mod_dir else None
+    license_id = "UNKNOWN"
+    license_name = ""
+    if license_file:
+        license_name = license_file.name
+        license_id = detect_license(license_file)
+    return {
+        "name": name,
+        "version": version,
+        "license": license_id,
+        "license_file": license_name,
+        "license_path": str(license_file) if license_file else "",
+        "license_dest": format_license_filename(name, version, license_name) if license_file else "",
+    }
+
+
+def resolve_go_module_dirs(modules: list[dict]) -> dict[str, str]:
+    """Map name@version to a module directory, downloading whatever is missing."""
+    cache = load_go_mod_dir_cache()
+    dirs: dict[str, str] = {}
+    missing: list[str] = []
+    for mod in modules:
+        name = mod.get("Path")
+        version = mod.get("Version")
+        if mod.get("Main") or not name or not version:
+            continue
+        key = f"{name}@{version}"
+        existing = mod.get("Dir")
+        if existing and os.path.isdir(existing):
+            dirs[key] = existing
+        elif cache.get(key) and os.path.isdir(cache[key]):
+            dirs[key] = cache[key]
+        else:
+            missing.append(key)
+
+    if missing:
+        downloaded = download_go_modules(missing)
+        dirs.update(downloaded)
+        if downloaded:
+            cache.update(downloaded)
+            save_go_mod_dir_cache(cache)
+    return dirs
+
+
+def download_go_modules(keys: list[str]) -> dict[str, str]:
+    # One `go mod download` for every missing module instead of a toolchain start per module.
+    # go exits non-zero if any module fails but still reports the others, so don't use check.
     try:
-        data = json.loads(run(["go", "mod", "download", "-json", f"{name}@{version}"], cwd=BACKEND_DIR))
+        proc = subprocess.run(
+            ["go", "mod", "download", "-json", *keys],
+            cwd=str(BACKEND_DIR),
+            check=False,
+            stdout=subprocess.PIPE,
+        )
+        results = decode_json_stream(proc.stdout)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    dirs: dict[str, str] = {}
+    for data in results:
         mod_dir = data.get("Dir")
-        if mod_dir and os.path.isdir(mod_dir):
-            return mod_dir
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        return None
-    return None
+        if data.get("Path") and data.get("Version") and mod_dir and os.path.isdir(mod_dir):
+            dirs[f"{data['Path']}@{data['Version']}"] = mod_dir
+    return dirs
 
 
-def find_license_file(module_dir: Path) -> Path | None:
-    files = [p for p in module_dir.iterdir() if p.is_file() and LICENSE_RE.match(p.name)]
-    if not files:
-        for entry in module_dir.iterdir():
-            if not entry.is_dir():
-                continue
-            files.extend([p for p in entry.iterdir() if p.is_file() and LICENSE_RE.match(p.name)])
-    if not files:
-        return None
+def load_go_mod_dir_cache() -> dict[str, str]:
+    try:
+        data = json.loads(GO_MOD_DIR_CACHE.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {key: value for key, value in data.items() if isinstance(value, str)}
+
+
+def save_go_mod_dir_cache(cache: dict[str, str]) -> None:
+    try:
+        GO_MOD_DIR_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        GO_MOD_DIR_CACHE.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    except OSError:
+        pass
+
 
-    def rank(p: Path) -> tuple[int, str]:
-        lower = p.name.lower()
-        if lower in {"license", "license.txt", "license.md", "license.rst"}:
-            return (0, lower)
-        if lower.startswith("license."):
-            return (1, lower)
-        if lower.startswith("licen"):
-            return (2, lower)
-        if lower in {"copying", "copying.txt", "copying.md", "copying.rst"}:
-            return (3, lower)
-        if lower.startswith("copying"):
-            return (4, lower)
-        if lower in {"notice", "notice.txt", "notice.md", "notice.rst"}:
-            return (5, lower)
-        if lower.startswith("notice"):
-            return (6, lower)
-        return (7, lower)
-
-    files.sort(key=rank)
-    return files[0]
+def is_license_name(name: str) -> bool:
+    lower = name.lower()
+    return lower in LICENSE_NAME_PREFIXES or lower.startswith(LICENSE_NAME_DOTTED)
+
+
+def license_file_rank(name: str) -> tuple[int, str]:
+    lower = name.lower()
+    if lower in {"license", "license.txt", "license.md", "license.rst"}:
+        return (0, lower)
+    if lower.startswith("license."):
+        return (1, lower)
+    if lower.startswith("licen"):
+        return (2, lower)
+    if lower in {"copying", "copying.txt", "copying.md", "copying.rst"}:
+        return (3, lower)
+    if lower.startswith("copying"):
+        return (4, lower)
+    if lower in {"notice", "notice.txt", "notice.md", "notice.rst"}:
+        return (5, lower)
+    if lower.startswith("notice"):
+        return (6, lower)
+    return (7, lower)
+
+
+# Nothing ranks below a bare LICENSE, so the scan can stop as soon as one is seen.
+BEST_LICENSE_RANK = license_file_rank("LICENSE")
+
+
+def scan_best_license_file(
+    directory: str, subdirs: list[str] | None = None
+) -> tuple[tuple[int, str], os.DirEntry] | None:
+    # DirEntry carries the file type from readdir, so is_file/is_dir need no extra stat
+    # unless the entry is a symlink. subdirs is only complete when nothing was found.
+    best = None
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file():
+                if not is_license_name(entry.name):
+                    continue
+                rank = license_file_rank(entry.name)
+                # Strict < keeps the first of equally ranked names, like a stable sort.
+                if best is None or rank < best[0]:
+                    best = (rank, entry)
+                    if rank == BEST_LICENSE_RANK:
+                        return best
+            elif subdirs is not None and entry.is_dir():
+                subdirs.append(entry.path)
+    return best
+
+
+def find_license_file(module_dir: Path) -> Path | None:
+    subdirs: list[str] = []
+    best = scan_best_license_file(str(module_dir), subdirs)
+    if best is None:
+        for subdir in subdirs:
+            found = scan_best_license_file(subdir)
+            if found and (best is None or found[0] < best[0]):
+                best = found
+                if best[0] == BEST_LICENSE_RANK:
+                    break
+    return Path(best[1].path) if best else None
 
 
 def detect_license(path: Path) -> str:
     try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
+        with path.open("rb") as fh:
+            text = fh.read(LICENSE_HEAD_BYTES).decode("utf-8", errors="ignore")
     except OSError:
         text = ""
-    for name, pattern in LICENSE_PATTERNS.items():
-        if pattern.search(text):
+    lowered = text.lower()
+    for name, anchor, search in LICENSE_CHECKS:
+        if anchor in lowered and search(text):
             return name
-    if MIT_PHRASE.search(text):
+    if MIT_PHRASE in lowered:
         return "MIT"
-    if BSD_PHRASE.search(text):
-        return "BSD-3-Clause" if BSD_NEITHER.search(text) else "BSD-2-Clause"
+    if BSD_PHRASE in lowered:
+        return "BSD-3-Clause" if BSD_NEITHER in lowered else "BSD-2-Clause"
     return "UNKNOWN"
 
 
 def parse_npm_packages() -> tuple[list[dict[str, str]], list[dict[str, str]]]:
     if not FRONTEND_LOCK.exists():
         return [], []
-    data = json.loads(FRONTEND_LOCK.read_text(encoding="utf-8"))
-    packages = data.get("packages", {})
+    entries = read_npm_lock_entries(FRONTEND_LOCK.read_bytes())
 
     merged: dict[tuple[str, str], dict[str, str]] = {}
     dev_only: dict[tuple[str, str], bool] = {}
 
-    for path, info in packages.items():
-        if not path.startswith("node_modules/"):
-            continue
+    with ThreadPoolExecutor(max_workers=LICENSE_SCAN_WORKERS) as pool:
+        license_files = list(pool.map(find_npm_license_file, (path for path, _ in entries)))
+
+    for (path, info), license_file in zip(entries, license_files):
         name = info.get("name") or path.replace("node_modules/", "")
         version = info.get("version") or ""
         license_id = normalize_npm_license(info)
-        package_dir = FRONTEND_DIR / path
-        license_file = find_license_file(package_dir) if package_dir.exists() else None
         key = (name, version)
         if key not in merged:
             merged[key] = {
@@ -172,6 +305,7 @@ def parse_npm_packages() -> tuple[list[dict[str, str]], list[dict[str, str]]]:
                 "version": version,
                 "license": license_id,
                 "license_path": str(license_file) if license_file else "",
+                "license_dest": format_license_filename(name, version, license_file.name) if license_file else "",
             }
             dev_only[key] = bool(info.get("dev", False))
         else:
@@ -181,6 +315,7 @@ def parse_npm_packages() -> tuple[list[dict[str, str]], list[dict[str, str]]]:
                 merged[key]["license"] = license_id
             if not merged[key]["license_path"] and license_file:
                 merged[key]["license_path"] = str(license_file)
+                merged[key]["license_dest"] = format_license_filename(name, version, license_file.name)
 
     runtime = []
     dev = []
@@ -195,6 +330,29 @@ def parse_npm_packages() -> tuple[list[dict[str, str]], list[dict[str, str]]]:
     return runtime, dev
 
 
+def read_npm_lock_entries(raw: bytes) -> list[tuple[str, dict]]:
+    # Only the node_modules/ entries of "packages" matter, so locate their keys with a regex
+    # and decode each entry object on its own instead of building the whole lockfile tree.
+    # The rest of each entry (dependencies, engines, integrity, ...) is dropped right away.
+    text = raw.decode("utf-8")
+    start = text.find('"packages"')
+    if start < 0:
+        return []
+    decode = json.JSONDecoder().raw_decode
+    entries = []
+    match = NPM_LOCK_ENTRY_RE.search(text, start)
+    while match:
+        info, end = decode(text, match.end() - 1)
+        entries.append((match[1], {field: info[field] for field in NPM_LOCK_FIELDS if field in info}))
+        match = NPM_LOCK_ENTRY_RE.search(text, end)
+    return entries
+
+
+def find_npm_license_file(path: str) -> Path | None:
+    package_dir = FRONTEND_DIR / path
+    return find_license_file(package_dir) if package_dir.exists() else None
+
+
 def normalize_npm_license(info: dict) -> str:
     license_id = info.get("license") or ""
     if license_id:
@@ -257,47 +415,45 @@ def write_notices(
     include_dev: bool,
 ) -> None:
     timestamp = resolve_generated_at()
-    lines: list[str] = []
-    lines.append("# Third-Party Notices")
-    lines.append("")
-    lines.append("This file is generated by scripts/generate_third_party_notices.py.")
-    lines.append(f"Generated at {timestamp}.")
-    lines.append("")
-    lines.append("## Summary")
-    lines.append(f"- Go modules (backend): {len(go_modules)}")
-    lines.append(f"- npm packages (frontend runtime): {len(npm_runtime)}")
+    buf = io.StringIO()
+    w = buf.write
+    w("# Third-Party Notices\n")
+    w("\n")
+    w("This file is generated by scripts/generate_third_party_notices.py.\n")
+    w(f"Generated at {timestamp}.\n")
+    w("\n")
+    w("## Summary\n")
+    w(f"- Go modules (backend): {len(go_modules)}\n")
+    w(f"- npm packages (frontend runtime): {len(npm_runtime)}\n")
     if include_dev:
-        lines.append(f"- npm packages (frontend dev-only): {len(npm_dev)}")
+        w(f"- npm packages (frontend dev-only): {len(npm_dev)}\n")
     else:
-        lines.append("- npm packages (frontend dev-only): omitted (use --include-dev)")
-    lines.append("- External tools: 1")
-    lines.append("")
-    lines.append("## Go modules (backend)")
+        w("- npm packages (frontend dev-only): omitted (use --include-dev)\n")
+    w("- External tools: 1\n")
+    w("\n")
+    w("## Go modules (backend)\n")
     for mod in go_modules:
-        lines.append(f"- {mod['name']}@{mod['version']} - {mod['license']}")
-    lines.append("")
-    lines.append("## npm packages (frontend runtime)")
+        w(f"- {mod['name']}@{mod['version']} - {mod['license']}\n")
+    w("\n")
+    w("## npm packages (frontend runtime)\n")
     for pkg in npm_runtime:
-        license_id = pkg["license"] or "UNKNOWN"
-        lines.append(f"- {pkg['name']}@{pkg['version']} - {license_id}")
-    lines.append("")
+        w(f"- {pkg['name']}@{pkg['version']} - {pkg['license'] or 'UNKNOWN'}\n")
+    w("\n")
     if include_dev:
-        lines.append("## npm packages (frontend dev-only)")
+        w("## npm packages (frontend dev-only)\n")
         for pkg in npm_dev:
-            license_id = pkg["license"] or "UNKNOWN"
-            lines.append(f"- {pkg['name']}@{pkg['version']} - {license_id}")
-        lines.append("")
-    lines.append("## External tools")
-    lines.append("- rclone - MIT (https://github.com/rclone/rclone)")
-    lines.append("")
-    lines.append("Notes:")
-    lines.append("- License identifiers are best-effort and derived from dependency metadata or license files.")
-    lines.append("- Dev-only npm packages are not bundled into production builds by default.")
-    lines.append("- License texts are stored under third_party/licenses/.")
-    lines.append("- If you redistribute dependency binaries or sources, include their license texts and notices.")
-    lines.append("")
-
-    OUTPUT.write_text("\n".join(lines), encoding="utf-8")
+            w(f"- {pkg['name']}@{pkg['version']} - {pkg['license'] or 'UNKNOWN'}\n")
+        w("\n")
+    w("## External tools\n")
+    w("- rclone - MIT (https://github.com/rclone/rclone)\n")
+    w("\n")
+    w("Notes:\n")
+    w("- License identifiers are best-effort and derived from dependency metadata or license files.\n")
+    w("- Dev-only npm packages are not bundled into production builds by default.\n")
+    w("- License texts are stored under third_party/licenses/.\n")
+    w("- If you redistribute dependency binaries or sources, include their license texts and notices.\n")
+
+    OUTPUT.write_text(buf.getvalue(), encoding="utf-8", newline="")
 
 
 def copy_license_files(
@@ -312,37 +468,31 @@ def copy_license_files(
 
     seen: set[str] = set()
     for mod in go_modules:
-        src = mod.get("license_path")
-        if not src:
+        dest_name = mod.get("license_dest")
+        if not dest_name or dest_name in seen:
             continue
-        dest_name = format_license_filename(mod["name"], mod["version"], Path(src).name)
-        dest = GO_LICENSES_DIR / dest_name
-        if dest_name in seen:
-            continue
-        shutil.copy2(src, dest)
+        install_license_file(mod["license_path"], GO_LICENSES_DIR / dest_name)
         seen.add(dest_name)
 
     packages = npm_runtime + npm_dev if include_dev else npm_runtime
     for pkg in packages:
-        src = pkg.get("license_path")
-        if not src:
+        dest_name = pkg.get("license_dest")
+        if not dest_name or dest_name in seen:
             continue
-        dest_name = format_license_filename(pkg["name"], pkg["version"], Path(src).name)
-        dest = NPM_LICENSES_DIR / dest_name
-        if dest_name in seen:
-            continue
-        shutil.copy2(src, dest)
+        install_license_file(pkg["license_path"], NPM_LICENSES_DIR / dest_name)
         seen.add(dest_name)
 
     rclone_license = EXTERNAL_LICENSES_DIR / "rclone-LICENSE"
     manual_rclone_license = MANUAL_EXTERNAL_LICENSES_DIR / "rclone-LICENSE"
     if manual_rclone_license.is_file():
-        shutil.copy2(manual_rclone_license, rclone_license)
+        install_license_file(manual_rclone_license, rclone_license)
     elif not rclone_license.exists():
         try:
-            content = run(["curl", "-fsSL", RCLONE_LICENSE_URL])
+            with urllib.request.urlopen(RCLONE_LICENSE_URL, timeout=30) as resp:
+                content = resp.read().decode("utf-8")
             rclone_license.write_text(content, encoding="utf-8")
-        except subprocess.CalledProcessError:
+        except OSError:
+            # URLError, HTTP errors and timeouts are all OSError; the notice still lists rclone.
             pass
 
     copy_manual_licenses(GO_LICENSES_DIR, MANUAL_GO_LICENSES_DIR, go_modules)
@@ -350,6 +500,15 @@ def copy_license_files(
     copy_manual_external_licenses(EXTERNAL_LICENSES_DIR, MANUAL_EXTERNAL_LICENSES_DIR)
 
 
+def install_license_file(src: str | Path, dest: Path) -> None:
+    # License texts are only read after staging, so a hard link is as good as a copy and
+    # costs no data I/O. Fall back to copying across filesystems or where links are refused.
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
 def reset_dir(path: Path) -> None:
     if path.exists():
         shutil.rmtree(path)
@@ -359,19 +518,33 @@ def reset_dir(path: Path) -> None:
 def copy_manual_licenses(target_dir: Path, manual_dir: Path, packages: list[dict[str, str]]) -> None:
     if not manual_dir.exists():
         return
-    allowed_prefixes = {
-        f"{sanitize_identifier(pkg['name'])}@{sanitize_identifier(pkg['version'])}-" for pkg in packages
-    }
-    if not allowed_prefixes:
+    allowed_keys = {f"{sanitize_identifier(pkg['name'])}@{sanitize_identifier(pkg['version'])}" for pkg in packages}
+    if not allowed_keys:
         return
     for manual_file in manual_dir.iterdir():
         if not manual_file.is_file():
             continue
-        if any(manual_file.name.startswith(prefix) for prefix in allowed_prefixes):
+        if manual_license_key(manual_file.name, allowed_keys):
             dest = target_dir / manual_file.name
             if dest.exists():
                 continue
-            shutil.copy2(manual_file, dest)
+            install_license_file(manual_file, dest)
+
+
+def manual_license_key(filename: str, allowed_keys: set[str]) -> str | None:
+    # Manual files are named like format_license_filename output: "<name>@<version>-<file>".
+    # Sanitized names never contain "@", but versions may contain "-" (1.0.0-rc.1), so try
+    # each "-" after the "@" as the split point.
+    at = filename.find("@")
+    if at < 0:
+        return None
+    dash = filename.find("-", at)
+    while dash >= 0:
+        key = filename[:dash]
+        if key in allowed_keys:
+            return key
+        dash = filename.find("-", dash + 1)
+    return None
 
 
 def copy_manual_external_licenses(target_dir: Path, manual_dir: Path) -> None:
@@ -383,16 +556,19 @@ def copy_manual_external_licenses(target_dir: Path, manual_dir: Path) -> None:
         dest = target_dir / manual_file.name
         if dest.exists():
             continue
-        shutil.copy2(manual_file, dest)
+        install_license_file(manual_file, dest)
 
 
 def format_license_filename(name: str, version: str, license_name: str) -> str:
     return f"{sanitize_identifier(name)}@{sanitize_identifier(version)}-{license_name}"
 
 
+@functools.lru_cache(maxsize=8192)
 def sanitize_identifier(value: str) -> str:
+    # Every package name and version goes through here at least twice (license file names
+    # and the manual-license keys), so results are memoized.
     cleaned = value.replace("@", "").replace("/", "_")
-    return re.sub(r"[^A-Za-z0-9._+-]", "_", cleaned)
+    return SANITIZE_RE.sub("_", cleaned)
 
 
 def parse_args(argv: list[str]) -> dict[str, bool] | None:
@@ -0,0 +1,221 @@
+import importlib.util
+import json
+import pathlib
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+
+SCRIPT_PATH = pathlib.Path(__file__).with_name("generate_third_party_notices.py")
+SPEC = importlib.util.spec_from_file_location("generate_third_party_notices", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+class DecodeJSONStreamTests(unittest.TestCase):
+    def test_decodes_concatenated_go_json_objects(self):
+        raw = (
+            b'{\n\t"Path": "example.com/a",\n\t"Replace": {\n\t\t"Path": "example.com/b"\n\t}\n}\n'
+            b'{\n\t"Path": "example.com/c",\n\t"Version": "v1.0.0"\n}\n'
+        )
+
+        modules = MODULE.decode_json_stream(raw)
+
+        self.assertEqual(
+            modules,
+            [
+                {"Path": "example.com/a", "Replace": {"Path": "example.com/b"}},
+                {"Path": "example.com/c", "Version": "v1.0.0"},
+            ],
+        )
+
+    def test_empty_output_yields_no_objects(self):
+        self.assertEqual(MODULE.decode_json_stream(b" \n"), [])
+
+
+class ResolveGoModuleDirsTests(unittest.TestCase):
+    def test_downloads_missing_modules_once_and_caches_their_dirs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            listed = root / "listed"
+            downloaded = root / "downloaded"
+            listed.mkdir()
+            downloaded.mkdir()
+            modules = [
+                {"Path": "example.com/main", "Main": True},
+                {"Path": "example.com/listed", "Version": "v1.0.0", "Dir": str(listed)},
+                {"Path": "example.com/missing", "Version": "v2.0.0"},
+            ]
+            cache_file = root / "cache" / "go_mod_dirs.json"
+
+            with mock.patch.object(MODULE, "GO_MOD_DIR_CACHE", cache_file), mock.patch.object(
+                MODULE, "download_go_modules", return_value={"example.com/missing@v2.0.0": str(downloaded)}
+            ) as download:
+                first = MODULE.resolve_go_module_dirs(modules)
+                second = MODULE.resolve_go_module_dirs(modules)
+
+            download.assert_called_once_with(["example.com/missing@v2.0.0"])
+            expected = {
+                "example.com/listed@v1.0.0": str(listed),
+                "example.com/missing@v2.0.0": str(downloaded),
+            }
+            self.assertEqual(first, expected)
+            self.assertEqual(second, expected)
+
+
+class IsLicenseNameTests(unittest.TestCase):
+    def test_matches_bare_and_dotted_names_case_insensitively(self):
+        for name in ("LICENSE", "Licence", "COPYING.LIB", "notice.txt", "LICENSE.", "license.md.txt"):
+            self.assertTrue(MODULE.is_license_name(name), name)
+
+    def test_rejects_other_names(self):
+        for name in ("LICENSE-MIT", "licenses", "copyingx", ".license", "README.md", "unlicense"):
+            self.assertFalse(MODULE.is_license_name(name), name)
+
+
+class FindLicenseFileTests(unittest.TestCase):
+    def make_tree(self, root, names):
+        for name in names:
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x", encoding="utf-8")
+
+    def test_prefers_best_ranked_top_level_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            self.make_tree(root, ["NOTICE", "COPYING", "LICENSE-MIT", "License.md", "licenses/LICENSE", "README.md"])
+
+            self.assertEqual(MODULE.find_license_file(root), root / "License.md")
+
+    def test_bare_license_wins_and_ties_break_by_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            self.make_tree(root, ["LICENSE.txt", "LICENSE.md", "a/LICENSE", "b/LICENSE.rst", "b/LICENSE"])
+
+            self.assertEqual(MODULE.find_license_file(root), root / "LICENSE.md")
+            self.assertEqual(MODULE.find_license_file(root / "b"), root / "b" / "LICENSE")
+
+    def test_falls_back_to_one_level_of_subdirectories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            self.make_tree(root, ["README.md", "docs/NOTICE.txt", "pkg/LICENSE", "pkg/deeper/LICENSE.txt"])
+
+            self.assertEqual(MODULE.find_license_file(root), root / "pkg" / "LICENSE")
+
+    def test_returns_none_without_license_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            self.make_tree(root, ["README.md", "licensed/readme", "src/main.go"])
+
+            self.assertIsNone(MODULE.find_license_file(root))
+
+
+class DetectLicenseTests(unittest.TestCase):
+    def detect(self, text):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "LICENSE"
+            path.write_text(text, encoding="utf-8")
+            return MODULE.detect_license(path)
+
+    def test_detects_versioned_licenses(self):
+        self.assertEqual(self.detect("Apache License\n  Version 2.0, January 2004\n"), "Apache-2.0")
+        self.assertEqual(self.detect("GNU GENERAL PUBLIC LICENSE\n Version 3, 29 June 2007\n"), "GPL-3.0")
+        self.assertEqual(self.detect("GNU General Public License\nVersion 2, June 1991\n"), "GPL-2.0")
+
+    def test_anchor_without_version_match_falls_through(self):
+        text = "Licensed under the Apache License.\nPermission is hereby granted, free of charge, to any person obtaining a copy\n"
+
+        self.assertEqual(self.detect(text), "MIT")
+
+    def test_detects_bsd_variants_case_insensitively(self):
+        bsd2 = "Copyright (c) x\nREDISTRIBUTION AND USE IN SOURCE AND BINARY FORMS, with or without\n"
+
+        self.assertEqual(self.detect(bsd2), "BSD-2-Clause")
+        self.assertEqual(self.detect(bsd2 + "3. Neither the name of the copyright holder\n"), "BSD-3-Clause")
+
+    def test_only_the_file_head_is_scanned(self):
+        padding = "x" * MODULE.LICENSE_HEAD_BYTES
+
+        self.assertEqual(self.detect("ISC License\n" + padding), "ISC")
+        self.assertEqual(self.detect(padding + "ISC License\n"), "UNKNOWN")
+
+    def test_unrecognized_text_is_unknown(self):
+        self.assertEqual(self.detect("All rights reserved.\n"), "UNKNOWN")
+
+
+class ReadNpmLockEntriesTests(unittest.TestCase):
+    LOCK = {
+        "name": "frontend",
+        "packages": {
+            "": {"name": "frontend", "license": "MPL-2.0"},
+            "node_modules/a": {
+                "version": "1.0.0",
+                "license": "MIT",
+                "dev": True,
+                "dependencies": {"b": "^2.0.0"},
+                "engines": {"node": ">=18"},
+            },
+            "node_modules/a/node_modules/b": {"name": "b", "version": "2.0.0", "licenses": [{"type": "ISC"}]},
+        },
+    }
+
+    def test_keeps_node_modules_entries_with_merge_fields_only(self):
+        entries = MODULE.read_npm_lock_entries(json.dumps(self.LOCK, indent=2).encode("utf-8"))
+
+        self.assertEqual(
+            entries,
+            [
+                ("node_modules/a", {"version": "1.0.0", "license": "MIT", "dev": True}),
+                ("node_modules/a/node_modules/b", {"name": "b", "version": "2.0.0", "licenses": [{"type": "ISC"}]}),
+            ],
+        )
+
+    def test_skips_lookalike_keys_nested_inside_an_entry(self):
+        lock = {
+            "packages": {
+                "node_modules/a": {"version": "1.0.0", "extra": {"node_modules/fake": {"version": "9"}}},
+                "node_modules/c": {"version": "3.0.0"},
+            }
+        }
+
+        entries = MODULE.read_npm_lock_entries(json.dumps(lock).encode("utf-8"))
+
+        self.assertEqual([path for path, _ in entries], ["node_modules/a", "node_modules/c"])
+
+    def test_missing_packages_section_is_empty(self):
+        self.assertEqual(MODULE.read_npm_lock_entries(b'{"lockfileVersion": 3}'), [])
+
+
+class CopyManualLicensesTests(unittest.TestCase):
+    def test_copies_only_files_for_listed_packages(self):
+        packages = [
+            {"name": "@scope/pkg", "version": "1.0.0-rc.1"},
+            {"name": "is-mobile", "version": "5.0.0"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            manual_dir = pathlib.Path(tmp) / "manual"
+            target_dir = pathlib.Path(tmp) / "target"
+            manual_dir.mkdir()
+            target_dir.mkdir()
+            for name in (
+                "scope_pkg@1.0.0-rc.1-LICENSE",
+                "is-mobile@5.0.0-LICENSE",
+                "is-mobile@5.0.1-LICENSE",
+                "scope_pkg@1.0.0-LICENSE",
+                "README",
+            ):
+                (manual_dir / name).write_text(name, encoding="utf-8")
+
+            MODULE.copy_manual_licenses(target_dir, manual_dir, packages)
+
+            self.assertEqual(
+                sorted(path.name for path in target_dir.iterdir()),
+                ["is-mobile@5.0.0-LICENSE", "scope_pkg@1.0.0-rc.1-LICENSE"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()